@@ -9,23 +9,12 @@ Inclui:
 """
 
 import math
-from collections import defaultdict
+from collections import Counter
+from itertools import chain, islice, repeat
+from types import MappingProxyType
 
 # -------------------- BLOSUM62 --------------------
-class Blosum62:
-    """
-    Matriz de substituição BLOSUM62 (acesso via método `subst`).
-    
-    A tabela é carregada internamente e disponibiliza scores inteiros para pares
-    de aminoácidos.
-    
-    Example:
-        >>> b = Blosum62()
-        >>> b.subst("A", "A")
-        4
-    """
-    def __init__(self):
-        tabela = """
+_BLOSUM62_TXT = """
    A  R  N  D  C  Q  E  G  H  I  L  K  M  F  P  S  T  W  Y  V  B  Z  X  -
 A  4 -1 -2 -2  0 -1 -1  0 -2 -1 -1 -1 -1 -2 -1  1  0 -3 -2  0 -2 -1  0 -4
 R -1  5  0 -2 -3  1  0 -2  0 -3 -2  2 -1 -3 -2 -1 -1 -3 -2 -3 -1  0 -1 -4
@@ -52,13 +41,35 @@ Z -1  0  0  1 -3  3  4 -2  0 -3 -3  1 -1 -3 -1  0 -1 -3 -2 -2  1  4 -1 -4
 X  0 -1 -1 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -2  0  0 -2 -1 -1 -1 -1 -1 -4
 - -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4  1
 """
-        tabela = [l.split() for l in tabela.splitlines() if l]
-        headers, *rows = tabela
-        self.tab = defaultdict(dict)
-        for row in rows:
-            aa, *vals = row
-            for h, v in zip(headers, vals):
-                self.tab[aa][h] = int(v)
+
+def _ler_matriz(texto):
+    tabela = [l.split() for l in texto.splitlines() if l]
+    headers, *rows = tabela
+    tab = {}
+    for row in rows:
+        aa, *vals = row
+        tab[aa] = {h: int(v) for h, v in zip(headers, vals)}
+    return tab
+
+# Lida uma única vez, na importação do módulo; só de leitura (tabela e linhas),
+# pois é partilhada por todas as instâncias de `Blosum62`
+_BLOSUM62 = MappingProxyType({aa: MappingProxyType(linha)
+                              for aa, linha in _ler_matriz(_BLOSUM62_TXT).items()})
+
+class Blosum62:
+    """
+    Matriz de substituição BLOSUM62 (acesso via método `subst`).
+    
+    A tabela é carregada uma única vez (na importação do módulo) e partilhada
+    por todas as instâncias, exposta só de leitura em `tab`; disponibiliza
+    scores inteiros para pares de aminoácidos.
+    
+    Example:
+        >>> b = Blosum62()
+        >>> b.subst("A", "A")
+        4
+    """
+    tab = _BLOSUM62
 
     def subst(self, x, y):
         """
@@ -77,6 +88,29 @@ X  0 -1 -1 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -2  0  0 -2 -1 -1 -1 -1 -1 -4
         """
         return self.tab[x][y]
 
+    def score_matrix(self, s1, s2):
+        """
+        Devolve a matriz de scores de todos os pares (s1[i], s2[j]).
+        
+        Cada linha é obtida da tabela com `map` (em C), em vez de uma chamada a
+        `subst` por par; as linhas usadas são copiadas uma vez para `dict`, cujo
+        acesso é mais rápido do que através da vista só de leitura.
+        
+        Args:
+            s1 (str): Símbolos das linhas.
+            s2 (str): Símbolos das colunas.
+        
+        Returns:
+            List[List[int]]: Matriz len(s1) x len(s2) com os scores BLOSUM62.
+        
+        Example:
+            >>> Blosum62().score_matrix("AW", "AW")
+            [[4, -3], [-3, 11]]
+        """
+        tab = self.tab
+        linhas = {x: dict(tab[x]).__getitem__ for x in set(s1)}
+        return [list(map(linhas[x], s2)) for x in s1]
+
 
 # -------------------- Utilitários --------------------
 def _clean_seq(seq):
@@ -84,8 +118,22 @@ def _clean_seq(seq):
         raise TypeError("seq cannot be None")
     return seq.upper().strip()
 
-def _argmax(items):
-    return max(range(len(items)), key=lambda i: items[i])
+def _profile(s1, alfabeto, submat):
+    # Perfil da query: scores de cada resíduo distinto de s1 contra o alfabeto
+    # do alvo (no máximo |alfabeto|^2 chamadas a `subst`, independente de n, m).
+    subst = submat.subst
+    return {a: {b: subst(a, b) for b in alfabeto} for a in set(s1)}
+
+def _subst_rows(s1, s2, submat):
+    # Uma linha de scores (contra toda a s2) por resíduo distinto de s1. Se a
+    # matriz souber gerar as linhas (`score_matrix`), usa-as diretamente; caso
+    # contrário expande o perfil com `map` (em C).
+    score_matrix = getattr(submat, "score_matrix", None)
+    if score_matrix is not None:
+        distintos = list(set(s1))
+        return dict(zip(distintos, score_matrix(distintos, s2)))
+    perfil = _profile(s1, set(s2), submat)
+    return {a: list(map(linha.__getitem__, s2)) for a, linha in perfil.items()}
 
 # -------------------- Matrizes simples --------------------
 def simple_substitution_matrix(match=1, mismatch=-1, alphabet="ACGT"):
@@ -113,16 +161,35 @@ def simple_substitution_matrix(match=1, mismatch=-1, alphabet="ACGT"):
             mat[(a,b)] = match if a==b else mismatch
     return mat
 
+# -------------------- Traceback empacotado --------------------
+# Códigos do traceback (2 bits por célula): 0=stop, 1=D, 2=U, 3=L.
+# Cada linha é guardada em bytes com 4 células por byte (a célula j ocupa os
+# bits 7-6 do byte j//4 quando j%4 == 0, ..., os bits 1-0 quando j%4 == 3).
+_DIGITOS = bytes.maketrans(b"\x00\x01\x02\x03", b"0123")
+
+def _empacotar(codigos):
+    # Os códigos são lidos como um número em base 4 (conversão feita em C).
+    w = -(-len(codigos) // 4) * 4
+    return int(bytes(codigos).translate(_DIGITOS).ljust(w, b"0"), 4).to_bytes(w // 4, "big")
+
+def _celula(linha, j):
+    return (linha[j >> 2] >> (6 - 2*(j & 3))) & 3
+
 # -------------------- Needleman-Wunsch --------------------
-def _nw_traceback(bt, s1, s2):
+def _borda(m, gap):
+    # Primeira linha do DP global, [0, gap, 2*gap, ..., m*gap], gerada em C
+    return list(range(0, (m+1)*gap, gap)) if gap else [0]*(m+1)
+
+def _nw_traceback(bt, s1, s2, band=None):
+    # Com banda, a linha i do traceback começa na coluna max(0, i-band-1).
     a1, a2 = [], []
     i, j = len(s1), len(s2)
     while i > 0 or j > 0:
-        move = bt[i][j]
-        if move == 'D':
+        move = _celula(bt[i], j if band is None else j - max(0, i-band-1))
+        if move == 1:
             a1.append(s1[i-1]); a2.append(s2[j-1])
             i -= 1; j -= 1
-        elif move == 'U':
+        elif move == 2:
             a1.append(s1[i-1]); a2.append('-')
             i -= 1
         else:
@@ -130,7 +197,47 @@ def _nw_traceback(bt, s1, s2):
             j -= 1
     return ''.join(reversed(a1)), ''.join(reversed(a2))
 
-def needleman_wunsch(seq1, seq2, submat, gap=-1):
+def _nw_fill(s1, s2, submat, gap):
+    # Só a linha anterior do DP é lida durante o preenchimento: guardamos
+    # apenas essa (memória O(m)) e o traceback completo.
+    # Percorre-se por linhas e não por anti-diagonais: sem vetorização, as
+    # anti-diagonais só acrescentam indexação 2-D por célula, enquanto a linha
+    # é lida em sequência com `zip` (anterior, anterior deslocada, scores).
+    n, m = len(s1), len(s2)
+    rows = _subst_rows(s1, s2, submat)
+    prev = _borda(m, gap)
+    bt = [_empacotar([0] + [3]*m)]
+    for i in range(1,n+1):
+        # diagonal, cima e substituição percorridos em paralelo; a esquerda é o
+        # último valor escrito (sem indexação por célula)
+        l = i*gap
+        dp_i = [l]; bt_i = [2]
+        for diag, up, s in zip(prev, islice(prev, 1, None), rows[s1[i-1]]):
+            d = diag + s; u = up + gap; l += gap
+            if d >= u and d >= l: l = d; bt_i.append(1)
+            elif u >= l: l = u; bt_i.append(2)
+            else: bt_i.append(3)
+            dp_i.append(l)
+        prev = dp_i; bt.append(_empacotar(bt_i))
+    return prev[-1], bt
+
+def _nw_score(s1, s2, submat, gap):
+    # Só o score: a mesma recorrência de `_nw_fill`, sem traceback.
+    n, m = len(s1), len(s2)
+    rows = _subst_rows(s1, s2, submat)
+    prev = _borda(m, gap)
+    for i in range(1,n+1):
+        l = i*gap
+        dp_i = [l]
+        for diag, up, s in zip(prev, islice(prev, 1, None), rows[s1[i-1]]):
+            d = diag + s; u = up + gap; l += gap
+            if u > l: l = u
+            if d > l: l = d
+            dp_i.append(l)
+        prev = dp_i
+    return prev[-1]
+
+def needleman_wunsch(seq1, seq2, submat, gap=-1, return_alignment=True):
     """
     Alinhamento global usando Needleman-Wunsch.
     
@@ -142,9 +249,12 @@ def needleman_wunsch(seq1, seq2, submat, gap=-1):
         seq2 (str): Segunda sequência.
         submat: Objeto com método `subst(x, y)` que devolve o score de substituição.
         gap (int): Penalização de gap. Default: -1.
+        return_alignment (bool): Se False, devolve apenas o score (sem guardar o
+            traceback; ver `needleman_wunsch_score`). Default: True.
     
     Returns:
-        Tuple[int, str, str]: (score, seq1_alinhada, seq2_alinhada).
+        Tuple[int, str, str]: (score, seq1_alinhada, seq2_alinhada), ou apenas
+        o score (int) se `return_alignment` for False.
     
     Raises:
         TypeError: Se alguma sequência for None (propagado de `_clean_seq`).
@@ -156,34 +266,151 @@ def needleman_wunsch(seq1, seq2, submat, gap=-1):
         (4, 'A', 'A')
     """
     s1, s2 = _clean_seq(seq1), _clean_seq(seq2)
+    if not return_alignment:
+        return _nw_score(s1, s2, submat, gap)
+    score, bt = _nw_fill(s1, s2, submat, gap)
+    return score, *_nw_traceback(bt,s1,s2)
+
+def needleman_wunsch_score(seq1, seq2, submat, gap=-1):
+    """
+    Score do alinhamento global Needleman-Wunsch, sem reconstruir o alinhamento.
+    
+    Mantém apenas a linha anterior do DP e não guarda traceback (memória O(m)),
+    o que convém quando só interessa o score (ex.: triagem de muitos candidatos).
+    
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        submat: Objeto com método `subst(x, y)` que devolve o score de substituição.
+        gap (int): Penalização de gap. Default: -1.
+    
+    Returns:
+        int: Score ótimo (igual ao de `needleman_wunsch`).
+    
+    Raises:
+        TypeError: Se alguma sequência for None (propagado de `_clean_seq`).
+    
+    Example:
+        >>> needleman_wunsch_score("HEAGAWGHEE", "PAWHEAE", Blosum62(), gap=-8)
+        -8
+    """
+    return needleman_wunsch(seq1, seq2, submat, gap, return_alignment=False)
+
+def _nw_fill_banded(s1, s2, submat, gap, band):
+    # Igual a `_nw_fill`, mas a linha i só cobre as colunas lo-1..hi, com
+    # lo = max(1, i-band) e hi = min(m, i+band); fora da banda vale -inf.
     n, m = len(s1), len(s2)
-    dp = [[0]*(m+1) for _ in range(n+1)]
-    bt = [[None]*(m+1) for _ in range(n+1)]
-    for i in range(1,n+1): dp[i][0]=i*gap; bt[i][0]='U'
-    for j in range(1,m+1): dp[0][j]=j*gap; bt[0][j]='L'
+    rows = _subst_rows(s1, s2, submat)
+    neg = -math.inf
+    prev = _borda(min(m, band), gap)
+    bt = [_empacotar([0] + [3]*(len(prev)-1))]
     for i in range(1,n+1):
-        for j in range(1,m+1):
-            scores=[dp[i-1][j-1]+submat.subst(s1[i-1],s2[j-1]),
-                    dp[i-1][j]+gap,
-                    dp[i][j-1]+gap]
-            k=_argmax(scores)
-            dp[i][j]=scores[k]
-            bt[i][j]=['D','U','L'][k]
-    return dp[n][m], *_nw_traceback(bt,s1,s2)
+        lo, hi = max(1, i-band), min(m, i+band)
+        # a linha anterior começa na coluna max(0, i-band-2)
+        off = lo - 1 - max(0, i-band-2)
+        # a coluna 0 só está na banda enquanto i <= band
+        l = i*gap if i <= band else neg
+        dp_i = [l]; bt_i = [2 if i <= band else 0]
+        ups = chain(islice(prev, off+1, None), repeat(neg))
+        for diag, up, s in zip(islice(prev, off, None), ups, rows[s1[i-1]][lo-1:hi]):
+            d = diag + s; u = up + gap; l += gap
+            if d >= u and d >= l: l = d; bt_i.append(1)
+            elif u >= l: l = u; bt_i.append(2)
+            else: bt_i.append(3)
+            dp_i.append(l)
+        prev = dp_i; bt.append(_empacotar(bt_i))
+    return prev[-1], bt
+
+def needleman_wunsch_banded(seq1, seq2, submat, gap=-1, band=16):
+    """
+    Alinhamento global Needleman-Wunsch restrito a uma banda em torno da diagonal.
+    
+    Só são preenchidas as células com |i - j| <= band, o que reduz tempo e
+    memória para O((n+m)·band). O resultado coincide com `needleman_wunsch`
+    sempre que o alinhamento ótimo não sai da banda (adequado a sequências de
+    comprimento e conteúdo semelhantes).
+    
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        submat: Objeto com método `subst(x, y)` que devolve o score de substituição.
+        gap (int): Penalização de gap. Default: -1.
+        band (int): Largura da banda; é alargada para pelo menos |n - m|. Default: 16.
+    
+    Returns:
+        Tuple[int, str, str]: (score, seq1_alinhada, seq2_alinhada).
+    
+    Raises:
+        TypeError: Se alguma sequência for None (propagado de `_clean_seq`).
+    
+    Example:
+        >>> b = Blosum62()
+        >>> needleman_wunsch_banded("HEAGAWGHEE", "HEAGAWGHE", b, band=2)
+        (56, 'HEAGAWGHEE', 'HEAGAWGH-E')
+    """
+    s1, s2 = _clean_seq(seq1), _clean_seq(seq2)
+    band = max(band, abs(len(s1)-len(s2)))
+    if band >= max(len(s1), len(s2)):
+        return needleman_wunsch(s1, s2, submat, gap)
+    score, bt = _nw_fill_banded(s1, s2, submat, gap, band)
+    return score, *_nw_traceback(bt,s1,s2,band)
 
 # -------------------- Smith-Waterman --------------------
-def _sw_traceback(dp, bt, s1, s2, start_i, start_j):
+def _sw_traceback(bt, s1, s2, start_i, start_j):
+    # células com score 0 têm código 0 (stop), o que termina o traceback
     a1,a2=[],[]
     i,j=start_i,start_j
-    while i>0 and j>0 and dp[i][j]>0:
-        move=bt[i][j]
-        if move=='D': a1.append(s1[i-1]); a2.append(s2[j-1]); i-=1;j-=1
-        elif move=='U': a1.append(s1[i-1]); a2.append('-'); i-=1
-        elif move=='L': a1.append('-'); a2.append(s2[j-1]); j-=1
+    while i>0 and j>0:
+        move=_celula(bt[i],j)
+        if move==1: a1.append(s1[i-1]); a2.append(s2[j-1]); i-=1;j-=1
+        elif move==2: a1.append(s1[i-1]); a2.append('-'); i-=1
+        elif move==3: a1.append('-'); a2.append(s2[j-1]); j-=1
         else: break
     return ''.join(reversed(a1)), ''.join(reversed(a2))
 
-def smith_waterman(seq1, seq2, submat, gap=-1):
+def _sw_fill(s1, s2, submat, gap):
+    # Como em `_nw_fill`, só a linha anterior do DP é mantida.
+    n,m=len(s1),len(s2)
+    rows=_subst_rows(s1,s2,submat)
+    prev=[0]*(m+1)
+    bt=[bytes(-(-(m+1)//4))]
+    best=(0,0,0)
+    for i in range(1,n+1):
+        l=0
+        dp_i=[0]; bt_i=[0]
+        for diag,up,s in zip(prev,islice(prev,1,None),rows[s1[i-1]]):
+            d=diag+s; u=up+gap; l+=gap
+            if 0>=d and 0>=u and 0>=l: l=0; bt_i.append(0)
+            elif d>=u and d>=l: l=d; bt_i.append(1)
+            elif u>=l: l=u; bt_i.append(2)
+            else: bt_i.append(3)
+            dp_i.append(l)
+        prev=dp_i; bt.append(_empacotar(bt_i))
+        top=max(dp_i)
+        if top>best[0]: best=(top,i,dp_i.index(top))
+    return bt,best
+
+def _sw_score(s1, s2, submat, gap):
+    # Só o melhor score local: a recorrência de `_sw_fill`, sem traceback.
+    m=len(s2)
+    rows=_subst_rows(s1,s2,submat)
+    prev=[0]*(m+1)
+    best=0
+    for c in s1:
+        l=0
+        dp_i=[0]
+        for diag,up,s in zip(prev,islice(prev,1,None),rows[c]):
+            d=diag+s; u=up+gap; l+=gap
+            if u>l: l=u
+            if d>l: l=d
+            if l<0: l=0
+            dp_i.append(l)
+        prev=dp_i
+        top=max(dp_i)
+        if top>best: best=top
+    return best
+
+def smith_waterman(seq1, seq2, submat, gap=-1, return_alignment=True):
     """
     Alinhamento local usando Smith-Waterman.
     
@@ -195,9 +422,12 @@ def smith_waterman(seq1, seq2, submat, gap=-1):
         seq2 (str): Segunda sequência.
         submat: Objeto com método `subst(x, y)` que devolve o score de substituição.
         gap (int): Penalização de gap. Default: -1.
+        return_alignment (bool): Se False, devolve apenas o score (sem guardar o
+            traceback; ver `smith_waterman_score`). Default: True.
     
     Returns:
-        Tuple[int, str, str]: (melhor_score_local, seq1_alinhada, seq2_alinhada).
+        Tuple[int, str, str]: (melhor_score_local, seq1_alinhada, seq2_alinhada),
+        ou apenas o score (int) se `return_alignment` for False.
     
     Raises:
         TypeError: Se alguma sequência for None (propagado de `_clean_seq`).
@@ -208,22 +438,35 @@ def smith_waterman(seq1, seq2, submat, gap=-1):
         True
     """
     s1,s2=_clean_seq(seq1),_clean_seq(seq2)
-    n,m=len(s1),len(s2)
-    dp=[[0]*(m+1) for _ in range(n+1)]
-    bt=[[None]*(m+1) for _ in range(n+1)]
-    best=(0,0,0)
-    for i in range(1,n+1):
-        for j in range(1,m+1):
-            scores=[0,
-                    dp[i-1][j-1]+submat.subst(s1[i-1],s2[j-1]),
-                    dp[i-1][j]+gap,
-                    dp[i][j-1]+gap]
-            k=_argmax(scores)
-            dp[i][j]=scores[k]
-            bt[i][j]=['0','D','U','L'][k]
-            if dp[i][j]>best[0]: best=(dp[i][j],i,j)
+    if not return_alignment:
+        return _sw_score(s1,s2,submat,gap)
+    bt,best=_sw_fill(s1,s2,submat,gap)
     score,i,j=best
-    return score,*_sw_traceback(dp,bt,s1,s2,i,j)
+    return score,*_sw_traceback(bt,s1,s2,i,j)
+
+def smith_waterman_score(seq1, seq2, submat, gap=-1):
+    """
+    Melhor score local Smith-Waterman, sem reconstruir o alinhamento.
+    
+    Mantém apenas a linha anterior do DP e não guarda traceback (memória O(m)).
+    
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        submat: Objeto com método `subst(x, y)` que devolve o score de substituição.
+        gap (int): Penalização de gap. Default: -1.
+    
+    Returns:
+        int: Melhor score local (igual ao de `smith_waterman`).
+    
+    Raises:
+        TypeError: Se alguma sequência for None (propagado de `_clean_seq`).
+    
+    Example:
+        >>> smith_waterman_score("HEAGAWGHEE", "PAWHEAE", Blosum62(), gap=-8)
+        20
+    """
+    return smith_waterman(seq1, seq2, submat, gap, return_alignment=False)
 
 # -------------------- Consenso e Alinhamento Progressivo --------------------
 def consensus(alignment):
@@ -243,29 +486,54 @@ def consensus(alignment):
         >>> consensus(["A-C", "ACC", "ATC"])
         'ACC'
     """
-    cols = zip(*alignment)
-    cons=[]
-    for col in cols:
-        counts={}
-        for c in col:
-            if c!='-': counts[c]=counts.get(c,0)+1
-        cons.append(max(counts,key=counts.get) if counts else '-')
-    return ''.join(cons)
-
-def progressive_alignment(seqs, submat, gap=-1):
+    return _consenso(_contagens(alignment))
+
+def _contagens(alignment):
+    """Contagens por coluna (sem gaps), pela ordem de aparecimento."""
+    contagens=[]
+    for col in zip(*alignment):
+        # contagem da coluna inteira em C; os gaps saem depois, numa só operação
+        cnt=Counter(col)
+        cnt.pop('-',None)
+        contagens.append(cnt)
+    return contagens
+
+def _consenso(contagens):
+    """Consenso a partir das contagens por coluna ('-' se a coluna estiver vazia)."""
+    # o Counter mantém a ordem de aparecimento, pelo que o desempate continua
+    # a favor do primeiro símbolo da coluna
+    return ''.join(max(cnt,key=cnt.__getitem__) if cnt else '-' for cnt in contagens)
+
+def _cortes(c_aln):
+    # Posições dos gaps do consenso alinhado em coordenadas do alinhamento
+    # antigo; `find` salta em C entre gaps, sem percorrer os restantes símbolos.
+    cortes=[]
+    p=c_aln.find('-')
+    while p!=-1:
+        cortes.append(p-len(cortes))
+        p=c_aln.find('-',p+1)
+    return cortes
+
+def progressive_alignment(seqs, submat, gap=-1, band=None):
     """
     Alinhamento múltiplo progressivo por consenso + alinhamento global.
     
     Estratégia:
     1) Alinha as duas primeiras sequências globalmente.
     2) Calcula consenso do alinhamento atual.
-    3) Alinha o consenso (sem '-') com a próxima sequência.
+    3) Alinha o consenso (sem '-') com a próxima sequência (NW; com banda se
+       `band` for dado).
     4) Insere gaps no alinhamento anterior para acompanhar o alinhamento do consenso.
     
     Args:
         seqs (List[str]): Lista de sequências (>= 2).
         submat: Objeto com método `subst(x, y)`.
         gap (int): Penalização de gap. Default: -1.
+        band (int, opcional): Se dado, cada passo usa `needleman_wunsch_banded`
+            com esta banda (alargada para a diferença de comprimentos). Mais
+            rápido para sequências de comprimento e conteúdo semelhantes, mas
+            pode dar um alinhamento subótimo se o caminho ótimo sair da banda.
+            Default: None (NW completo).
     
     Returns:
         List[str]: Lista de sequências alinhadas.
@@ -282,14 +550,26 @@ def progressive_alignment(seqs, submat, gap=-1):
     if len(seqs)<2: raise ValueError("Need at least two sequences")
     _,a1,a2=needleman_wunsch(seqs[0],seqs[1],submat,gap)
     alignment=[a1,a2]
+    # contagens por coluna mantidas entre iterações: cada nova linha só
+    # acrescenta os seus votos, em vez de recontar o alinhamento inteiro
+    contagens=_contagens(alignment)
     for s in seqs[2:]:
-        cons=consensus(alignment)
-        _,c_aln,s_aln=needleman_wunsch(cons.replace('-',''),s,submat,gap)
-        idx=0
-        for c in c_aln:
-            if c=='-':
-                for i in range(len(alignment)):
-                    alignment[i]=alignment[i][:idx]+'-'+alignment[i][idx:]
-            idx+=1
+        cons=_consenso(contagens)
+        cons=cons.replace('-','')
+        if band is None: _,c_aln,s_aln=needleman_wunsch(cons,s,submat,gap)
+        else: _,c_aln,s_aln=needleman_wunsch_banded(cons,s,submat,gap,band)
+        # cada sequência é reconstruída uma única vez (junção das fatias)
+        cortes=_cortes(c_aln)
+        if cortes:
+            limites=list(zip([0]+cortes,cortes+[None]))
+            alignment=['-'.join(a[i:j] for i,j in limites) for a in alignment]
+            novas=[]
+            for i,j in limites:
+                novas+=contagens[i:j]
+                novas.append(Counter())
+            novas.pop()
+            contagens=novas
+        for cnt,c in zip(contagens,s_aln):
+            if c!='-': cnt[c]+=1
         alignment.append(s_aln)
     return alignment
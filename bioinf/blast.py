@@ -1,40 +1,41 @@
 
 
 # blast.py
-from typing import List, Dict, Tuple
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import eq, itemgetter
+from typing import List, Dict, Mapping, Optional, Tuple, Union
 
 # ---------- Helpers de extensão/score (baixa complexidade) ----------
 
+def _pontuar(a: str, b: str, match: int, mismatch: int) -> int:
+    """Pontua duas fatias do mesmo tamanho (comparação posição a posição em C)."""
+    iguais = sum(map(eq, a, b))
+    return iguais * match + (min(len(a), len(b)) - iguais) * mismatch
+
 def _score_seed(query: str, seq: str, i_query: int, i_seq: int,
                 k: int, match: int, mismatch: int) -> int:
-    """Pontua o k-mer seed."""
-    score = 0
-    for t in range(k):
-        score += match if query[i_query + t] == seq[i_seq + t] else mismatch
-    return score
+    """Pontua o k-mer seed (IndexError se o seed sair de alguma das strings)."""
+    if i_query + k > len(query) or i_seq + k > len(seq):
+        raise IndexError("O seed ultrapassa o fim da query ou do subject")
+    return _pontuar(query[i_query:i_query + k], seq[i_seq:i_seq + k], match, mismatch)
 
 def _extend_left(query: str, seq: str, i_query: int, i_seq: int,
                  match: int, mismatch: int) -> Tuple[int, int]:
     """Extensão à esquerda: devolve (delta_score, extensão_em_caracteres)."""
-    limite = min(i_query, i_seq)
-    delta = 0
-    left = 0
-    # percorre o número máximo seguro de passos para a esquerda
-    for off in range(1, limite + 1):
-        delta += match if query[i_query - off] == seq[i_seq - off] else mismatch
-        left = off
+    # número máximo seguro de passos para a esquerda
+    left = min(i_query, i_seq)
+    delta = _pontuar(query[i_query - left:i_query], seq[i_seq - left:i_seq], match, mismatch)
     return delta, left
 
 def _extend_right(query: str, seq: str, i_query: int, i_seq: int, k: int,
                   match: int, mismatch: int) -> Tuple[int, int]:
     """Extensão à direita: devolve (delta_score, extensão_em_caracteres)."""
     # número máximo de passos sem sair da string
-    limite = min(len(query) - (i_query + k), len(seq) - (i_seq + k))
-    delta = 0
-    right = 0
-    for off in range(limite):
-        delta += match if query[i_query + k + off] == seq[i_seq + k + off] else mismatch
-        right = off + 1
+    right = max(0, min(len(query) - (i_query + k), len(seq) - (i_seq + k)))
+    inicio_q, inicio_s = i_query + k, i_seq + k
+    delta = _pontuar(query[inicio_q:inicio_q + right], seq[inicio_s:inicio_s + right], match, mismatch)
     return delta, right
 
 # ---------- Funções públicas ----------
@@ -126,13 +127,16 @@ def estender_hit(query: str, seq: str, i_query: int, i_seq: int,
     Returns:
         Tuple[int, str, str]: (score_total, query_alinhada, subject_alinhada).
     
+    Raises:
+        IndexError: Se o seed (k posições) ultrapassar o fim da query ou do subject.
+    
     Example:
         >>> estender_hit("ATGCA", "TTGCA", i_query=1, i_seq=1, k=3)
         (6, 'TGCA', 'TGCA')
     """
     # pontuar o seed k-mer
     score = _score_seed(query, seq, i_query, i_seq, k, match, mismatch)
-    # extensões esquerda e direita com loops de limites fixos (sem while)
+    # extensões esquerda e direita até ao limite das strings
     delta_esq, left = _extend_left(query, seq, i_query, i_seq, match, mismatch)
     delta_dir, right = _extend_right(query, seq, i_query, i_seq, k, match, mismatch)
     score += (delta_esq + delta_dir)
@@ -141,7 +145,23 @@ def estender_hit(query: str, seq: str, i_query: int, i_seq: int,
     s_aln = seq[i_seq   - left : i_seq   + k + right]
     return score, q_aln, s_aln
 
-def blast_simplificado(query: str, banco: List[str], k: int = 3) -> List[Tuple[int, int, str, str]]:
+def _estender_bloco(query: str, banco: Union[List[str], Mapping[int, str]], k: int,
+                    hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, str, str]]:
+    """
+    Estende um bloco de hits (i_query, id_seq, i_seq); usado também pelos processos.
+
+    `banco` só precisa de `banco[id_seq]` para os ids do bloco: em paralelo
+    recebe apenas o subconjunto {id_seq: seq} desses subjects.
+    """
+    resultados = []
+    for i_query, id_seq, i_seq in hits:
+        score, q_aln, s_aln = estender_hit(query, banco[id_seq], i_query, i_seq, k)
+        resultados.append((score, id_seq, q_aln, s_aln))
+    return resultados
+
+def blast_simplificado(query: str, banco: List[str], k: int = 3,
+                       top: Optional[int] = None,
+                       processos: int = 1) -> List[Tuple[int, int, str, str]]:
     """
     Executa um BLAST simplificado baseado em seeds (k-mers) e extensão sem gaps.
     
@@ -151,10 +171,21 @@ def blast_simplificado(query: str, banco: List[str], k: int = 3) -> List[Tuple[i
     3) Estende cada hit e calcula o score.
     4) Ordena resultados por score (descendente).
     
+    Como a extensão vai até ao fim das strings, hits na mesma diagonal
+    (id_seq, i_seq - i_query) dão o mesmo resultado: cada diagonal é estendida
+    uma única vez e o resultado é reutilizado para os restantes hits.
+    
     Args:
         query (str): Sequência query.
         banco (List[str]): Lista de sequências do banco (subjects).
         k (int): Tamanho do k-mer. Default: 3.
+        top (Optional[int]): Se indicado, devolve apenas os `top` melhores
+            resultados (seleção parcial, sem ordenar a lista toda). Default: None.
+        processos (int): Número de processos para estender as diagonais em
+            paralelo (blocos independentes, cada um com apenas os subjects dos
+            seus hits). Só compensa para muitos hits e várias CPUs; o ganho
+            não foi medido (desenvolvido num ambiente com um só núcleo).
+            Default: 1 (sequencial).
     
     Returns:
         List[Tuple[int, int, str, str]]: Lista de resultados (score, id_seq, q_aln, s_aln)
@@ -166,8 +197,28 @@ def blast_simplificado(query: str, banco: List[str], k: int = 3) -> List[Tuple[i
     """
     indice = indexar_banco(banco, k)
     hits = encontrar_hits(query, indice, k)
-    melhores: List[Tuple[int, int, str, str]] = []
-    for i_query, id_seq, i_seq in hits:
-        score, q_aln, s_aln = estender_hit(query, banco[id_seq], i_query, i_seq, k)
-        melhores.append((score, id_seq, q_aln, s_aln))
-    return sorted(melhores, key=lambda x: x[0], reverse=True)
+
+    # primeiro hit de cada diagonal (é esse que é estendido)
+    por_diagonal: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+    for hit in hits:
+        por_diagonal.setdefault((hit[1], hit[2] - hit[0]), hit)
+    representantes = list(por_diagonal.values())
+
+    total = len(representantes)
+    if processos > 1 and total > 1:
+        passo = -(-total // (processos * 4))
+        blocos = [representantes[i:i + passo] for i in range(0, total, passo)]
+        # cada bloco leva só os subjects dos seus hits, não o banco inteiro
+        subbancos = [{id_seq: banco[id_seq] for _, id_seq, _ in bloco} for bloco in blocos]
+        with ProcessPoolExecutor(max_workers=processos) as ex:
+            partes = ex.map(_estender_bloco, repeat(query), subbancos, repeat(k), blocos)
+            resultados = [r for parte in partes for r in parte]
+    else:
+        resultados = _estender_bloco(query, banco, k, representantes)
+
+    por_diagonal_res = dict(zip(por_diagonal, resultados))
+    melhores = [por_diagonal_res[(id_seq, i_seq - i_query)] for i_query, id_seq, i_seq in hits]
+    if top is None:
+        return sorted(melhores, key=itemgetter(0), reverse=True)
+    # equivalente a sorted(...)[:top], com a mesma ordem nos empates
+    return heapq.nlargest(top, melhores, key=itemgetter(0))
@@ -2,8 +2,10 @@
 
 # filo.py
 from __future__ import annotations
-from typing import Dict, List, Tuple
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from itertools import repeat
 
 __all__ = [
     "calcular_matriz_distancias",
@@ -32,6 +34,119 @@ def _pdist(a: str, b: str) -> float:
     return dif / n
 
 
+def _codificar(seq: str) -> int:
+    """
+    Codifica uma sequência ASCII como inteiro (um byte por posição).
+
+    Args:
+        seq (str): Sequência ASCII.
+
+    Returns:
+        int: Inteiro big-endian com os bytes da sequência.
+    """
+    return int.from_bytes(seq.encode("ascii"), "big")
+
+
+def _pdist_codificado(n: int, x: int, y: int) -> float:
+    """
+    p-distância entre duas sequências codificadas por `_codificar`.
+
+    O XOR anula os bytes iguais; as diferenças são os bytes não nulos,
+    contados em C por `bytes.count`.
+
+    Args:
+        n (int): Comprimento comum das sequências.
+        x (int): Sequência 1 codificada.
+        y (int): Sequência 2 codificada.
+
+    Returns:
+        float: Proporção de diferenças em [0, 1].
+    """
+    if n == 0:
+        return 0.0
+    return (n - (x ^ y).to_bytes(n, "big").count(0)) / n
+
+
+_DNA = frozenset("ACGT")
+_DNA_2BIT = str.maketrans("ACGT", "0123")
+
+
+def _codificar_2bit(seq: str) -> int:
+    """
+    Codifica uma sequência de DNA (A/C/G/T) com 2 bits por posição.
+
+    Args:
+        seq (str): Sequência apenas com A, C, G e T.
+
+    Returns:
+        int: Inteiro com A=00, C=01, G=10, T=11 (32 posições por palavra de 64 bits).
+    """
+    return int(seq.translate(_DNA_2BIT), 4)
+
+
+def _pdist_2bit(mascara: int, n: int, x: int, y: int) -> float:
+    """
+    p-distância entre duas sequências codificadas por `_codificar_2bit`.
+
+    Cada posição diferente tem pelo menos um bit a 1 no XOR; juntar os dois
+    bits de cada par no bit baixo e aplicar a máscara 0101... deixa um bit
+    por diferença, contado por `int.bit_count` (popcount).
+
+    Args:
+        mascara (int): Inteiro com o padrão 01 repetido `n` vezes.
+        n (int): Comprimento comum das sequências.
+        x (int): Sequência 1 codificada.
+        y (int): Sequência 2 codificada.
+
+    Returns:
+        float: Proporção de diferenças em [0, 1].
+    """
+    z = x ^ y
+    return ((z | z >> 1) & mascara).bit_count() / n
+
+
+def _codificacao(nomes: List[str]) -> Tuple[Callable[[object, object], float], list]:
+    """
+    Escolhe a p-distância mais rápida suportada pelas sequências.
+
+    DNA (A/C/G/T) usa 2 bits por posição e popcount; outras sequências
+    ASCII usam um byte por posição e XOR; as restantes usam `_pdist`.
+    As sequências são codificadas uma única vez.
+
+    Args:
+        nomes (List[str]): Sequências (todas com o mesmo tamanho).
+
+    Returns:
+        Tuple[Callable, list]: (distancia, codigos), com `distancia(x, y)`
+        aplicável aos códigos (pela ordem de `nomes`).
+    """
+    n = len(nomes[0])
+    if n == 0:
+        return _pdist, list(nomes)
+    if _DNA.issuperset("".join(nomes)):
+        mascara = int("01" * n, 2)
+        return partial(_pdist_2bit, mascara, n), [_codificar_2bit(s) for s in nomes]
+    if all(s.isascii() for s in nomes):
+        return partial(_pdist_codificado, n), [_codificar(s) for s in nomes]
+    return _pdist, list(nomes)
+
+
+def _linhas(distancia: Callable[[object, object], float], codigos: list,
+            n: int) -> List[List[float]]:
+    """
+    Calcula as primeiras `n` linhas do triângulo superior da matriz de `codigos`.
+
+    As linhas [inicio, fim) da matriz completa obtêm-se com
+    `_linhas(distancia, codigos[inicio:], fim - inicio)`: cada bloco só recebe
+    (e, em paralelo, só serializa) as codificações que usa.
+
+    Returns:
+        List[List[float]]: Para cada i, as distâncias de i a cada j > i.
+    """
+    return [list(map(partial(distancia, codigos[i]), codigos[i + 1:]))
+            for i in range(n)]
+
+
 def _validate_equal_lengths(sequencias: List[str]) -> None:
     """
     Valida que a lista não é vazia e que todas as sequências têm o mesmo tamanho.
@@ -53,7 +168,8 @@ def _validate_equal_lengths(sequencias: List[str]) -> None:
 # API pública: Matriz de Distâncias
 # ---------------------------------------------------------------------
 
-def calcular_matriz_distancias(sequencias: List[str]) -> Dict[str, Dict[str, float]]:
+def calcular_matriz_distancias(sequencias: List[str],
+                               processos: int = 1) -> Dict[str, Dict[str, float]]:
     """
     Calcula a matriz de distâncias usando **p-distância**.
 
@@ -63,6 +179,9 @@ def calcular_matriz_distancias(sequencias: List[str]) -> Dict[str, Dict[str, flo
 
     Args:
         sequencias (List[str]): Lista de sequências (todas com o mesmo tamanho).
+        processos (int): Número de processos para calcular as linhas da
+            matriz em paralelo (blocos de linhas independentes). Só compensa
+            para muitas sequências. Default: 1 (sequencial).
 
     Returns:
         Dict[str, Dict[str, float]]: Matriz de distâncias simétrica (0 na diagonal).
@@ -78,10 +197,22 @@ def calcular_matriz_distancias(sequencias: List[str]) -> Dict[str, Dict[str, flo
     for a in nomes:
         matriz[a][a] = 0.0
     # Metade superior (e espelhar para a inferior)
-    for a, b in combinations(nomes, 2):
-        d = _pdist(a, b)
-        matriz[a][b] = d
-        matriz[b][a] = d
+    distancia, codigos = _codificacao(nomes)
+    total = len(nomes)
+    if processos > 1 and total > 2:
+        passo = -(-total // (processos * 4))
+        inicios = range(0, total, passo)
+        sufixos = (codigos[i:] for i in inicios)
+        tamanhos = [min(passo, total - i) for i in inicios]
+        with ProcessPoolExecutor(max_workers=processos) as ex:
+            blocos = ex.map(_linhas, repeat(distancia), sufixos, tamanhos)
+            linhas = [linha for bloco in blocos for linha in bloco]
+    else:
+        linhas = _linhas(distancia, codigos, total)
+    for i, a in enumerate(nomes):
+        for b, d in zip(nomes[i + 1:], linhas[i]):
+            matriz[a][b] = d
+            matriz[b][a] = d
     return matriz
 
 
@@ -89,33 +220,58 @@ def calcular_matriz_distancias(sequencias: List[str]) -> Dict[str, Dict[str, flo
 # Helpers de UPGMA
 # ---------------------------------------------------------------------
 
-def _closest_pair(matriz: Dict[str, Dict[str, float]],
-                  clusters: Dict[str, Tuple[str, float]]) -> Tuple[str, str, float]:
+def _matriz_densa(matriz: Dict[str, Dict[str, float]],
+                  nomes: List[str]) -> List[List[float]]:
+    """
+    Converte a matriz dict-de-dicts numa lista de listas indexada por posição.
+
+    Returns:
+        List[List[float]]: Matriz nxn, pela ordem de `nomes`.
+    """
+    return [[matriz[a][b] for b in nomes] for a in nomes]
+
+
+def _min_linha(D: List[List[float]], ids: List[int], a: int) -> Tuple[float, int]:
     """
-    Encontra o par de clusters com menor distância.
+    Mínimo da linha a no triângulo superior (colunas à direita de a).
 
     Returns:
-        Tuple[str, str, float]: (a, b, dmin) com a <-> b o par mais próximo.
+        Tuple[float, int]: (distância, id do cluster da primeira coluna com
+        esse valor); (inf, -1) se não houver colunas à direita.
     """
-    best_a = best_b = ""
-    best = float("inf")
-    for a, b in combinations(clusters.keys(), 2):
-        d = matriz[a][b]
-        if d < best:
-            best = d
-            best_a, best_b = a, b
-    return best_a, best_b, best
+    resto = D[a][a + 1:]
+    if not resto:
+        return float("inf"), -1
+    d = min(resto)
+    return d, ids[a + 1 + resto.index(d)]
 
 
-def _newick_join(a: str, b: str, dist_ab: float,
-                 clusters: Dict[str, Tuple[str, float]]) -> Tuple[str, float]:
+def _closest_pair(minimos: List[Tuple[float, int]],
+                  ids: List[int]) -> Tuple[int, int, float]:
+    """
+    Encontra o par de clusters com menor distância a partir dos mínimos por linha.
+
+    Em caso de empate prevalece a primeira linha e, dentro dela, a primeira
+    coluna — o mesmo par que `combinations` devolveria.
+
+    Returns:
+        Tuple[int, int, float]: (a, b, dmin) com as posições a < b do par.
+    """
+    valores = [v for v, _ in minimos]
+    best = min(valores)
+    a = valores.index(best)
+    return a, ids.index(minimos[a][1]), best
+
+
+def _newick_join(a: int, b: int, dist_ab: float,
+                 clusters: List[Tuple[str, float]]) -> Tuple[str, float]:
     """
     Une dois clusters em Newick e calcula a nova altura (UPGMA).
 
     Args:
-        a, b (str): Clusters a unir.
+        a, b (int): Posições dos clusters a unir.
         dist_ab (float): Distância entre a e b.
-        clusters: Mapa etiqueta -> (newick, altura).
+        clusters: Lista posição -> (newick, altura).
 
     Returns:
         Tuple[str, float]: (novo_newick, nova_altura).
@@ -128,29 +284,21 @@ def _newick_join(a: str, b: str, dist_ab: float,
     return f"({na}:{ramo_a:.6f},{nb}:{ramo_b:.6f})", altura
 
 
-def _average_linkage_row(matriz: Dict[str, Dict[str, float]],
-                         a: str, b: str, novo: str,
-                         restantes: List[str]) -> None:
-    """
-    Cria as distâncias do novo cluster para os restantes via média aritmética.
+def _merge_clusters(D: List[List[float]], a: int, b: int) -> None:
     """
-    matriz[novo] = {}
-    for k in restantes:
-        d = (matriz[a][k] + matriz[b][k]) / 2.0
-        matriz[novo][k] = d
-        matriz[k][novo] = d
-    matriz[novo][novo] = 0.0
+    Substitui as linhas/colunas a e b (a < b) pelo novo cluster, no fim.
 
-
-def _remove_old_clusters(matriz: Dict[str, Dict[str, float]],
-                         a: str, b: str) -> None:
-    """
-    Remove linhas/colunas dos clusters a e b da matriz.
+    As distâncias do novo cluster são a média aritmética das de a e b.
     """
-    for x in (a, b):
-        matriz.pop(x, None)
-        for linha in matriz.values():
-            linha.pop(x, None)
+    linha_a, linha_b = D[a], D[b]
+    novo = [(x + y) / 2.0 for x, y in zip(linha_a, linha_b)]
+    del novo[b], novo[a]
+    del D[b], D[a]
+    for linha, d in zip(D, novo):
+        del linha[b], linha[a]
+        linha.append(d)
+    novo.append(0.0)
+    D.append(novo)
 
 
 # ---------------------------------------------------------------------
@@ -172,33 +320,49 @@ def upgma(matriz: Dict[str, Dict[str, float]]) -> str:
         - Caso trivial: 0 clusters → retorna apenas `;`.
         - Caso trivial: 1 cluster  → retorna a etiqueta + `;`.
         - As etiquetas usadas são as chaves da matriz (neste projeto, as próprias sequências).
+        - A matriz de entrada não é alterada; as distâncias são copiadas para
+          uma matriz densa indexada por posição.
     """
-    # clusters: etiqueta -> (newick, altura)
-    clusters: Dict[str, Tuple[str, float]] = {name: (name, 0.0) for name in list(matriz.keys())}
+    nomes = list(matriz.keys())
 
     # Casos triviais
-    if not clusters:
+    if not nomes:
         return ";"
-    if len(clusters) == 1:
-        return f"{next(iter(clusters))};"
+    if len(nomes) == 1:
+        return f"{nomes[0]};"
+
+    # Matriz densa por posição; clusters[i] é o cluster da linha/coluna i e
+    # ids[i] um identificador crescente (a ordem das posições é a dos ids)
+    D = _matriz_densa(matriz, nomes)
+    clusters: List[Tuple[str, float]] = [(name, 0.0) for name in nomes]
+    ids = list(range(len(nomes)))
+    # Mínimo de cada linha em cache: só é recalculado quando o seu par
+    # desaparece, o que torna cada fusão O(n) no caso típico (em vez de O(n²))
+    minimos = [_min_linha(D, ids, a) for a in range(len(nomes))]
 
     # Itera até restar um cluster (a raiz)
     while len(clusters) > 1:
-        a, b, dmin = _closest_pair(matriz, clusters)
-
-        novo_newick, altura = _newick_join(a, b, dmin, clusters)
-
-        # Prepara chaves restantes (atuais na matriz) sem (a, b)
-        restantes = [k for k in list(matriz.keys()) if k not in (a, b)]
-
-        # Cria linha/coluna do novo cluster antes de remover a/b
-        _average_linkage_row(matriz, a, b, novo_newick, restantes)
-
-        # Remove antigos e atualiza clusters
-        _remove_old_clusters(matriz, a, b)
-        clusters.pop(a, None)
-        clusters.pop(b, None)
-        clusters[novo_newick] = (novo_newick, altura)
+        a, b, dmin = _closest_pair(minimos, ids)
+        ida, idb = ids[a], ids[b]
+
+        novo = _newick_join(a, b, dmin, clusters)
+
+        # Remove a/b e acrescenta o novo cluster no fim (mesma ordem que antes)
+        _merge_clusters(D, a, b)
+        del clusters[b], clusters[a]
+        clusters.append(novo)
+        novo_id = ids[-1] + 1
+        del ids[b], ids[a], minimos[b], minimos[a]
+        ids.append(novo_id)
+
+        # A nova coluna fica à direita de todas: só ganha em caso de valor
+        # estritamente menor (empates mantêm a coluna anterior)
+        for pos, (v, c) in enumerate(minimos):
+            if c == ida or c == idb:
+                minimos[pos] = _min_linha(D, ids, pos)
+            elif D[pos][-1] < v:
+                minimos[pos] = (D[pos][-1], novo_id)
+        minimos.append((float("inf"), -1))
 
     # Único elemento remanescente é a raiz em Newick
-    return f"{next(iter(clusters))};"
+    return f"{clusters[0][0]};"
@@ -1,6 +1,39 @@
 # motifs.py
 import re
 import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
+from itertools import repeat
+from operator import add, getitem, mul
+
+
+# Os padrões são convertidos e compilados uma única vez: as procuras seguintes
+# com o mesmo padrão reutilizam o `re.Pattern` guardado em cache.
+@lru_cache(maxsize=1024)
+def _compilar_iupac(padrao):
+    """Regex compilada de um padrão IUPAC."""
+    return re.compile(iupac_para_regex(padrao))
+
+@lru_cache(maxsize=1024)
+def _compilar_prosite(prosite):
+    """Regex compilada de um padrão PROSITE."""
+    return re.compile(prosite_para_regex(prosite))
+
+def _inicios_iupac(sequencia, padrao):
+    """Posições iniciais de um padrão IUPAC, sem sobreposição (como `re.finditer`)."""
+    regex = _compilar_iupac(padrao)
+    literal = regex.pattern
+    if "[" in literal:
+        return [m.start() for m in regex.finditer(sequencia)]
+    # padrão sem ambiguidades (ex.: sítios de restrição): `str.find` salta em C
+    # entre ocorrências, sem passar pelo motor de regex
+    inicios = []
+    n = len(literal)
+    i = sequencia.find(literal)
+    while i != -1:
+        inicios.append(i)
+        i = sequencia.find(literal, i + n)
+    return inicios
 
 
 # =========================================================
@@ -42,9 +75,10 @@ def iupac_para_regex(padrao):
     if not padrao:
         raise ValueError("Padrão vazio")
 
-    for c in padrao:
-        if c not in IUPAC:
-            raise ValueError(f"Símbolo IUPAC inválido: {c}")
+    invalidos = set(padrao).difference(IUPAC)
+    if invalidos:
+        c = next(c for c in padrao if c in invalidos)
+        raise ValueError(f"Símbolo IUPAC inválido: {c}")
 
     return "".join(IUPAC[c] for c in padrao)
 
@@ -52,6 +86,8 @@ def procura_iupac(sequencia, padrao):
     """
     Procura ocorrências (índices iniciais) de um padrão IUPAC numa sequência.
     
+    A regex de cada padrão é compilada uma única vez e guardada em cache.
+    
     Args:
         sequencia (str): Sequência onde procurar.
         padrao (str): Padrão IUPAC.
@@ -71,8 +107,36 @@ def procura_iupac(sequencia, padrao):
         raise TypeError("sequencia não pode ser None")
 
     sequencia = sequencia.upper().strip()
-    regex = iupac_para_regex(padrao)
-    return [m.start() for m in re.finditer(regex, sequencia)]
+    return _inicios_iupac(sequencia, padrao)
+
+def procura_iupac_many(sequencia, padroes):
+    """
+    Procura vários padrões IUPAC numa mesma sequência.
+    
+    A sequência é normalizada uma única vez e cada padrão usa a regex
+    compilada em cache; o resultado de cada padrão é igual ao de
+    `procura_iupac`.
+    
+    Args:
+        sequencia (str): Sequência onde procurar.
+        padroes (List[str]): Padrões IUPAC.
+    
+    Returns:
+        Dict[str, List[int]]: {padrão: posições iniciais (0-based)}.
+    
+    Raises:
+        TypeError: Se `sequencia` for None.
+        ValueError: Propagado de `iupac_para_regex` se algum padrão for inválido.
+    
+    Example:
+        >>> procura_iupac_many("ATGCAATG", ["ATG", "AAT"])
+        {'ATG': [0, 5], 'AAT': [4]}
+    """
+    if sequencia is None:
+        raise TypeError("sequencia não pode ser None")
+
+    sequencia = sequencia.upper().strip()
+    return {p: _inicios_iupac(sequencia, p) for p in padroes}
 
 
 # =========================================================
@@ -121,6 +185,8 @@ def procura_prosite(sequencia, prosite):
     """
     Procura ocorrências (índices iniciais) de um padrão PROSITE numa sequência.
     
+    A regex de cada padrão é compilada uma única vez e guardada em cache.
+    
     Args:
         sequencia (str): Sequência onde procurar.
         prosite (str): Padrão PROSITE.
@@ -140,8 +206,7 @@ def procura_prosite(sequencia, prosite):
         raise TypeError("sequencia não pode ser None")
 
     sequencia = sequencia.upper().strip()
-    regex = prosite_para_regex(prosite)
-    return [m.start() for m in re.finditer(regex, sequencia)]
+    return [m.start() for m in _compilar_prosite(prosite).finditer(sequencia)]
 
 
 # =========================================================
@@ -189,9 +254,7 @@ def digestao_dna(sequencia, sitio_restricao):
     if pos_corte < 0 or pos_corte > len(motivo):
         raise ValueError("Posição de corte fora do intervalo")
 
-    regex = iupac_para_regex(motivo)
-
-    inicios = [m.start() for m in re.finditer(regex, sequencia)]
+    inicios = _inicios_iupac(sequencia, motivo)
     cortes = sorted(set([i + pos_corte for i in inicios]))
 
     fragmentos = []
@@ -235,9 +298,13 @@ def tabela_contagens(seqs, alfabeto="ACGT", pseudocontagem=1):
     if any(len(seqs[0]) != len(s) for s in seqs):
         raise ValueError("As sequências não têm todas o mesmo tamanho!")
 
+    # com as sequências concatenadas, a coluna j é a fatia [j::L] (obtida em C,
+    # sem transpor com `zip`); `str.count` percorre-a também em C
+    todas = "".join(seqs)
+    l = len(seqs[0])
     return [
         {b: ocorrencias.count(b) + pseudocontagem for b in alfabeto}
-        for ocorrencias in zip(*seqs)
+        for ocorrencias in (todas[j::l] for j in range(l))
     ]
 
 def pwm(seqs, tipo="DNA", pseudocontagem=1):
@@ -322,10 +389,39 @@ def prob_gerar_sequencia(sequencia, matriz_pwm):
     if len(sequencia) != len(matriz_pwm):
         raise ValueError("Tamanho da sequência e do motif não são iguais!")
 
-    prob = 1.0
-    for letra, coluna in zip(sequencia.upper(), matriz_pwm):
-        prob *= coluna[letra]
-    return prob
+    # uma consulta por coluna e o produto (sequencial, como antes) feitos em C
+    return math.prod(map(getitem, matriz_pwm, sequencia.upper()), start=1.0)
+
+def log_prob_gerar_sequencia(sequencia, matriz_pwm):
+    """
+    Calcula o logaritmo natural da probabilidade de uma sequência segundo uma PWM.
+    
+    Soma os logaritmos coluna a coluna em vez de multiplicar as probabilidades,
+    pelo que não sofre underflow em motifs longos (onde `prob_gerar_sequencia`
+    chega a 0.0). Colunas com probabilidade 0 dão -inf.
+    
+    Args:
+        sequencia (str): Sequência com comprimento igual ao motif (len(PWM)).
+        matriz_pwm (List[dict]): PWM (lista de colunas).
+    
+    Returns:
+        float: log(probabilidade) da sequência.
+    
+    Raises:
+        ValueError: Se o comprimento da sequência não coincidir com a PWM.
+    
+    Example:
+        >>> m = [{'A': 1.0, 'C': 0.0}, {'A': 0.5, 'C': 0.5}]
+        >>> round(math.exp(log_prob_gerar_sequencia('AA', m)), 3)
+        0.5
+    """
+    if len(sequencia) != len(matriz_pwm):
+        raise ValueError("Tamanho da sequência e do motif não são iguais!")
+
+    probs = list(map(getitem, matriz_pwm, sequencia.upper()))
+    if 0 in probs:
+        return float("-inf")
+    return math.fsum(map(math.log, probs))
 
 def seq_mais_provavel(sequencia, matriz_pwm):
     """
@@ -355,11 +451,23 @@ def seq_mais_provavel(sequencia, matriz_pwm):
     if len(sequencia) < l:
         raise ValueError("A sequência tem que ser >= ao motif!")
 
-    janelas = [sequencia[i:i+l] for i in range(0, len(sequencia) - l + 1)]
-    probs = {s: prob_gerar_sequencia(s, matriz_pwm) for s in janelas}
-    maior = max(probs.values())
+    n = len(sequencia) - l + 1
+    if l and len(matriz_pwm[0]) ** l <= n // 4:
+        # motif curto: há muitas janelas repetidas, pelo que cada janela
+        # distinta é pontuada uma só vez
+        probs = {j: prob_gerar_sequencia(j, matriz_pwm)
+                 for j in set(sequencia[i:i+l] for i in range(n))}
+        maior = max(probs.values())
+        return sorted(j for j, p in probs.items() if p == maior)
 
-    return sorted(set([s for s, p in probs.items() if p == maior]))
+    # probabilidades de todas as janelas de uma vez, coluna a coluna
+    # (mesma ordem de multiplicações que `prob_gerar_sequencia`)
+    probs = [1.0] * n
+    for i, coluna in enumerate(matriz_pwm):
+        probs = list(map(mul, probs, map(coluna.__getitem__, sequencia[i:i+n])))
+    maior = max(probs)
+
+    return sorted(set([sequencia[i:i+l] for i, p in enumerate(probs) if p == maior]))
 
 
 # =========================================================
@@ -385,14 +493,13 @@ def pssm_de_pwm(matriz_pwm, alfabeto="ACGT"):
         0.0
     """
     bg = 1.0 / len(alfabeto)
-    pssm = []
-    for coluna in matriz_pwm:
-        d = {}
-        for b in alfabeto:
-            p = coluna.get(b, 0.0)
-            d[b] = float("-inf") if p == 0 else math.log2(p / bg)
-        pssm.append(d)
-    return pssm
+    # constantes e `log2` resolvidos uma vez, fora do ciclo por símbolo
+    log2 = math.log2
+    menos_inf = float("-inf")
+    return [
+        {b: log2(p / bg) if (p := coluna.get(b, 0.0)) != 0 else menos_inf for b in alfabeto}
+        for coluna in matriz_pwm
+    ]
 
 def score_kmer(pssm, kmer):
     """
@@ -415,12 +522,72 @@ def score_kmer(pssm, kmer):
     if len(kmer) != len(pssm):
         raise ValueError("O comprimento do kmer deve coincidir com a PSSM")
 
-    s = 0.0
-    for i, b in enumerate(kmer.upper()):
-        s += pssm[i].get(b, float("-inf"))
-    return s
+    # `.get` de cada coluna (aceita qualquer mapeamento, como `score_kmers_batch`);
+    # soma sequencial (como antes)
+    menos_inf = float("-inf")
+    return reduce(add, [coluna.get(b, menos_inf) for coluna, b in zip(pssm, kmer.upper())], 0.0)
 
-def melhor_subsequencia(pssm, sequencia):
+def score_kmers_batch(pssm, kmers):
+    """
+    Calcula o score de vários k-mers de uma só vez segundo uma PSSM.
+    
+    Equivalente a `[score_kmer(pssm, k) for k in kmers]`, mas percorre a PSSM
+    coluna a coluna, somando a contribuição de cada coluna a todos os k-mers
+    com `map` (em C). A ordem das somas é a de `score_kmer`, pelo que os
+    valores são idênticos.
+    
+    Args:
+        pssm (List[dict]): PSSM (lista de colunas).
+        kmers (List[str]): K-mers, todos com comprimento igual ao número de colunas.
+    
+    Returns:
+        List[float]: Score de cada k-mer, pela ordem de `kmers`.
+    
+    Raises:
+        ValueError: Se algum k-mer não tiver o comprimento da PSSM.
+    
+    Example:
+        >>> score_kmers_batch([{'A': 1.0, 'C': 0.5}, {'A': 2.0, 'C': 0.0}], ['AA', 'CA', 'AC'])
+        [3.0, 2.5, 1.0]
+    """
+    k = len(pssm)
+    if any(len(kmer) != k for kmer in kmers):
+        raise ValueError("O comprimento do kmer deve coincidir com a PSSM")
+
+    todos = "".join(kmers).upper()
+    if k == 0 or len(todos) != k * len(kmers):
+        # PSSM vazia ou maiúsculas que mudam o comprimento (fora de ASCII)
+        return [score_kmer(pssm, kmer) for kmer in kmers]
+
+    # a coluna j de todos os k-mers é a fatia todos[j::k]
+    menos_inf = float("-inf")
+    scores = [0.0] * len(kmers)
+    for j, coluna in enumerate(pssm):
+        scores = list(map(add, scores, map(coluna.get, todos[j::k], repeat(menos_inf))))
+    return scores
+
+def _scores_janelas(pssm, sequencia, bloco=4096):
+    """
+    Scores de todas as janelas de tamanho len(PSSM), calculados coluna a coluna.
+    
+    Cada coluna soma a sua contribuição a todas as janelas com `map` (em C),
+    pela mesma ordem de `score_kmer`, pelo que os valores são idênticos.
+    As janelas são tratadas em blocos de `bloco`, para que as listas
+    intermédias de cada passagem por coluna se mantenham em cache.
+    """
+    k = len(pssm)
+    n = len(sequencia) - k + 1
+    menos_inf = float("-inf")
+    todos = []
+    for ini in range(0, n, bloco):
+        m = min(bloco, n - ini)
+        scores = [0.0] * m
+        for i, coluna in enumerate(pssm, ini):
+            scores = list(map(add, scores, map(coluna.get, sequencia[i:i+m], repeat(menos_inf))))
+        todos += scores
+    return todos
+
+def melhor_subsequencia(pssm, sequencia, processos=1):
     """
     Devolve a melhor subsequência segundo uma PSSM.
     
@@ -429,6 +596,9 @@ def melhor_subsequencia(pssm, sequencia):
     Args:
         pssm (List[dict]): PSSM.
         sequencia (str): Sequência onde procurar.
+        processos (int): Número de processos para pontuar as janelas em
+            paralelo (troços independentes da sequência). Só compensa para
+            sequências longas. Default: 1 (sequencial).
     
     Returns:
         Tuple[str, int, float]: (melhor_kmer, posição_inicial, score).
@@ -448,16 +618,29 @@ def melhor_subsequencia(pssm, sequencia):
     if len(sequencia) < k:
         raise ValueError("Sequência mais curta do que o motif")
 
-    melhor = ""
-    melhor_pos = -1
-    melhor_score = float("-inf")
-
-    for i in range(0, len(sequencia) - k + 1):
-        kmer = sequencia[i:i+k]
-        sc = score_kmer(pssm, kmer)
-        if sc > melhor_score:
-            melhor_score = sc
-            melhor = kmer
-            melhor_pos = i
-
-    return melhor, melhor_pos, melhor_score
+    n = len(sequencia) - k + 1
+    if len(pssm[0]) ** k <= n // 4:
+        # motif curto: cada janela distinta é pontuada uma só vez e a posição
+        # é a da primeira ocorrência da melhor (empates: a mais à esquerda)
+        janelas = list(set(sequencia[i:i+k] for i in range(n)))
+        scores = dict(zip(janelas, score_kmers_batch(pssm, janelas)))
+        melhor_score = max(scores.values())
+        if melhor_score == float("-inf"):
+            return "", -1, melhor_score
+        melhor_pos = min(sequencia.find(j) for j, sc in scores.items() if sc == melhor_score)
+        return sequencia[melhor_pos:melhor_pos+k], melhor_pos, melhor_score
+
+    if processos > 1 and n > 1:
+        # troços com k-1 posições de sobreposição: cada janela fica num só troço
+        passo = -(-n // (processos * 4))
+        trocos = [sequencia[i:i + passo + k - 1] for i in range(0, n, passo)]
+        with ProcessPoolExecutor(max_workers=processos) as ex:
+            scores = [sc for parte in ex.map(_scores_janelas, repeat(pssm), trocos) for sc in parte]
+    else:
+        scores = _scores_janelas(pssm, sequencia)
+    melhor_score = max(scores)
+    if melhor_score == float("-inf"):
+        return "", -1, melhor_score
+
+    melhor_pos = scores.index(melhor_score)
+    return sequencia[melhor_pos:melhor_pos+k], melhor_pos, melhor_score
@@ -1,8 +1,28 @@
+# Tabelas de validação: `str.translate` apaga (em C) os símbolos permitidos;
+# a sequência é válida se não sobrar nenhum carácter.
+_APAGA_DNA = str.maketrans("", "", "ACGT")
+_APAGA_RNA = str.maketrans("", "", "ACGU")
+_APAGA_PROTEINA = str.maketrans("", "", "ACDEFGHIKLMNPQRSTVWY")
+
+# Emparelhamento A<->T, C<->G aplicado de uma só vez com `str.translate`
+_COMPLEMENTO = str.maketrans("ACGT", "TGCA")
+
+
+def _norm(seq):
+    """Normaliza uma sequência (strip + upper), uma só vez por chamada pública."""
+    return seq.strip().upper()
+
+
+def _valida(seq, apaga):
+    """True se `seq` (já normalizada) for não vazia e só tiver símbolos de `apaga`."""
+    return bool(seq) and not seq.translate(apaga)
+
+
 def dna(seq):
     """
     Verifica se uma sequência é DNA válido (apenas A, C, G, T).
 
-A validação é feita após normalização (upper + strip). Se a sequência
+A validação é feita após normalização (strip + upper). Se a sequência
 for vazia, é considerada inválida.
 
 Args:
@@ -19,10 +39,7 @@ Example:
     'DNA Inválido'
 
     """
-    seq = seq.upper().strip()
-    if not seq:
-        return "DNA Inválido"
-    if all(c in "ACGT" for c in seq):
+    if _valida(_norm(seq), _APAGA_DNA):
         return "DNA Válido"
     return "DNA Inválido"
 
@@ -31,7 +48,7 @@ def rna(seq):
     """
 Verifica se uma sequência é RNA válido (apenas A, C, G, U).
 
-A validação é feita após normalização (upper + strip). Se a sequência
+A validação é feita após normalização (strip + upper). Se a sequência
 for vazia, é considerada inválida.
 
 Args:
@@ -48,10 +65,7 @@ Example:
     'RNA Inválido'
 """ 
 
-    seq = seq.upper().strip()
-    if not seq:
-        return "RNA Inválido"
-    if all(c in "ACGU" for c in seq):
+    if _valida(_norm(seq), _APAGA_RNA):
         return "RNA Válido"
     return "RNA Inválido"
 
@@ -77,11 +91,7 @@ Example:
     'Proteína Inválida'
 """
 
-    seq = seq.upper().strip()
-    if not seq:
-        return "Proteína Inválida"
-    aa = "ACDEFGHIKLMNPQRSTVWY"
-    if all(c in aa for c in seq):
+    if _valida(_norm(seq), _APAGA_PROTEINA):
         return "Proteína Válida"
     return "Proteína Inválida"
 
@@ -106,8 +116,8 @@ Example:
     >>> dna_para_rna("ATGC")
     'AUGC'
 """
-    seq = seq.upper().strip()
-    if dna(seq) != "DNA Válido":
+    seq = _norm(seq)
+    if not _valida(seq, _APAGA_DNA):
         raise ValueError("DNA Inválido")
     return seq.replace("T", "U")
 
@@ -132,8 +142,7 @@ Example:
     >>> dna_reverso("ATGC")
     'GCAT'
 """
-    seq = seq.upper().strip()
-    if dna(seq) != "DNA Válido":
+    seq = _norm(seq)
+    if not _valida(seq, _APAGA_DNA):
         raise ValueError("DNA Inválido")
-    comp = {"A": "T", "T": "A", "C": "G", "G": "C"}
-    return "".join(comp[c] for c in seq[::-1])
+    return seq.translate(_COMPLEMENTO)[::-1]
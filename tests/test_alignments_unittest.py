@@ -1,7 +1,8 @@
 import unittest
 from bioinf.alignments import (
-    Blosum62, _clean_seq, _argmax, simple_substitution_matrix,
-    needleman_wunsch, smith_waterman, consensus, progressive_alignment
+    Blosum62, _clean_seq, _empacotar, _celula, simple_substitution_matrix,
+    needleman_wunsch, needleman_wunsch_banded, needleman_wunsch_score,
+    smith_waterman, smith_waterman_score, consensus, progressive_alignment
 )
 
 # -------------------- Classe de testes --------------------
@@ -17,9 +18,11 @@ class TestAlignments(unittest.TestCase):
         with self.assertRaises(TypeError):
             _clean_seq(None)
 
-    def test_argmax_basico(self):
-        self.assertEqual(_argmax([1, 3, 2]), 1)
-        self.assertEqual(_argmax([5, 5, 2]), 0)
+    def test_traceback_empacotado(self):
+        codigos = [0, 1, 2, 3, 3, 2, 1]
+        linha = _empacotar(codigos)
+        self.assertEqual(len(linha), 2)
+        self.assertEqual([_celula(linha, j) for j in range(len(codigos))], codigos)
 
     # -------------------- Blosum62 --------------------
     def test_blosum62_subst(self):
@@ -28,6 +31,22 @@ class TestAlignments(unittest.TestCase):
         self.assertEqual(bl.subst('A','G'), 0)
         self.assertEqual(bl.subst('W','Y'), 2)
 
+    def test_blosum62_score_matrix(self):
+        bl = Blosum62()
+        s1, s2 = "AWC", "WYA-"
+        self.assertEqual(bl.score_matrix(s1, s2),
+                         [[bl.subst(x, y) for y in s2] for x in s1])
+        self.assertEqual(bl.score_matrix("", "AW"), [])
+
+    def test_blosum62_tabela_so_de_leitura(self):
+        # a tabela é partilhada por todas as instâncias: não pode ser alterada
+        bl = Blosum62()
+        with self.assertRaises(TypeError):
+            bl.tab['A']['A'] = 0
+        with self.assertRaises(TypeError):
+            bl.tab['A'] = {}
+        self.assertEqual(Blosum62().subst('A', 'A'), 4)
+
     # -------------------- Matrizes simples --------------------
     def test_simple_substitution_matrix(self):
         mat = simple_substitution_matrix(match=2, mismatch=-1)
@@ -48,6 +67,23 @@ class TestAlignments(unittest.TestCase):
         self.assertEqual(a3, "")
         self.assertEqual(a4, "")
 
+    def test_needleman_wunsch_banded(self):
+        bl = Blosum62()
+        s1, s2 = "HEAGAWGHEEPAWHEAE", "HEAGAWGHEPAWHEAE"
+        # banda suficiente: igual ao NW completo
+        self.assertEqual(needleman_wunsch_banded(s1, s2, bl, gap=-4, band=2),
+                         needleman_wunsch(s1, s2, bl, gap=-4))
+        # banda alargada para |n - m| e sequências vazias
+        score, a1, a2 = needleman_wunsch_banded("ACDEFG", "A", bl, band=0)
+        self.assertEqual((a1.replace('-', ''), a2.replace('-', '')), ("ACDEFG", "A"))
+        self.assertEqual(needleman_wunsch_banded("", "", bl), (0, "", ""))
+
+    def test_needleman_wunsch_banded_banda_zero(self):
+        # banda 0: só a diagonal, sem atalhos pela coluna 0 fora da banda
+        bl = Blosum62()
+        self.assertEqual(needleman_wunsch_banded("NSAQK", "WFINK", bl, gap=-1, band=0),
+                         (-2, "NSAQK", "WFINK"))
+
     # -------------------- Smith-Waterman --------------------
     def test_smith_waterman_basico(self):
         bl = Blosum62()
@@ -57,12 +93,33 @@ class TestAlignments(unittest.TestCase):
         score2, a3, a4 = smith_waterman("AAA", "CCC", bl)
         self.assertGreaterEqual(score2, 0)
 
+    # -------------------- Apenas score --------------------
+    def test_scores_sem_alinhamento(self):
+        bl = Blosum62()
+        s1, s2 = "HEAGAWGHEE", "PAWHEAE"
+        self.assertEqual(needleman_wunsch_score(s1, s2, bl, gap=-8),
+                         needleman_wunsch(s1, s2, bl, gap=-8)[0])
+        self.assertEqual(smith_waterman_score(s1, s2, bl, gap=-8),
+                         smith_waterman(s1, s2, bl, gap=-8)[0])
+        self.assertEqual(needleman_wunsch(s1, s2, bl, gap=-8, return_alignment=False),
+                         needleman_wunsch_score(s1, s2, bl, gap=-8))
+        self.assertEqual(smith_waterman("AAA", "CCC", bl, return_alignment=False), 0)
+
     # -------------------- Consenso --------------------
     def test_consensus_basico(self):
         aln = ["AC-", "A-G", "AAG"]
         cons = consensus(aln)
         self.assertEqual(cons, "ACG")
 
+    def test_consensus_empate_e_gaps(self):
+        # Empate resolvido a favor do primeiro símbolo da coluna
+        self.assertEqual(consensus(["CA", "AC", "-C", "--"]), "CC")
+        self.assertEqual(consensus(["-", "-"]), "-")
+
+    def test_consensus_vazio(self):
+        self.assertEqual(consensus([]), "")
+        self.assertEqual(consensus(["", ""]), "")
+
     # -------------------- Alinhamento progressivo --------------------
     def test_progressive_alignment_basico(self):
         bl = Blosum62()
@@ -75,6 +132,17 @@ class TestAlignments(unittest.TestCase):
         with self.assertRaises(ValueError):
             progressive_alignment(["A"], bl)
 
+    def test_progressive_alignment_banda(self):
+        # banda (2) bem mais estreita do que a matriz (~33 x 33)
+        bl = Blosum62()
+        seqs = ["MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQ",
+                "MKTAYIAKQRQISFVKSHFSRQLEERLGLIEV",
+                "MKTAYIAKQRISFVKSHFSRQLEERLGLIEVQ"]
+        aln = progressive_alignment(seqs, bl, gap=-4, band=2)
+        self.assertEqual([a.replace('-', '') for a in aln], seqs)
+        self.assertEqual(aln, progressive_alignment(seqs, bl, gap=-4))
+        self.assertEqual(aln[2], "MKTAYIAKQR-ISFVKSHFSRQLEERLGLIEVQ")
+
 # -------------------- Executar os testes --------------------
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
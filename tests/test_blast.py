@@ -93,6 +93,13 @@ class TestBLASTLike(unittest.TestCase):
         self.assertEqual(as_[:3], "ATG")
         self.assertEqual(len(aq), len(as_))  # alinhamentos devem ter o mesmo comprimento
 
+    def test_estender_hit_seed_fora_dos_limites(self):
+        # o seed ultrapassa o fim do subject / da query (como no ciclo original)
+        with self.assertRaises(IndexError):
+            estender_hit("ATGCA", "TTG", i_query=1, i_seq=1, k=3)
+        with self.assertRaises(IndexError):
+            estender_hit("ATGCA", "TTGCA", i_query=3, i_seq=3, k=3)
+
     # ---------- blast_simplificado ----------
     def test_blast_simplificado_ordenacao_e_melhor_hit(self):
         query = "ATGCATGCA"
@@ -107,6 +114,19 @@ class TestBLASTLike(unittest.TestCase):
         scores = [r[0] for r in resultados]
         self.assertEqual(scores, sorted(scores, reverse=True))
 
+    def test_blast_simplificado_top(self):
+        query = "ATGCATGCA"
+        banco = ["ATGCATGCA", "TTGCATGGA", "ATGCGTACA"]
+        todos = blast_simplificado(query, banco, k=3)
+        self.assertEqual(blast_simplificado(query, banco, k=3, top=2), todos[:2])
+        self.assertEqual(blast_simplificado(query, banco, k=3, top=0), [])
+
+    def test_blast_simplificado_processos(self):
+        query = "ATGCATGCA"
+        banco = ["ATGCATGCA", "TTGCATGGA", "ATGCGTACA"]
+        self.assertEqual(blast_simplificado(query, banco, k=3, processos=2),
+                         blast_simplificado(query, banco, k=3))
+
     def test_blast_simplificado_sem_hits(self):
         query = "AAAAAA"
         banco = ["TTTTTT", "CCCCCC"]
@@ -27,6 +27,22 @@ class TestFilogenia(unittest.TestCase):
         matriz = calcular_matriz_distancias(sequencias)
         self.assertEqual(matriz["ATGC"]["ATGC"], 0.0)
 
+    def test_matriz_distancias_ascii_nao_dna(self):
+        # Fora de A/C/G/T usa a codificação de um byte por posição
+        matriz = calcular_matriz_distancias(["MKVL", "MKIL", "acgt"])
+        self.assertEqual(matriz["MKVL"]["MKIL"], 0.25)
+        self.assertEqual(matriz["MKVL"]["acgt"], 1.0)
+
+    def test_matriz_distancias_processos(self):
+        sequencias = ["ATGC", "ATGA", "TTGC", "ATTA", "CCGC"]
+        self.assertEqual(calcular_matriz_distancias(sequencias, processos=2),
+                         calcular_matriz_distancias(sequencias))
+
+    def test_matriz_distancias_nao_ascii(self):
+        # Sequências não-ASCII usam a comparação carácter a carácter
+        matriz = calcular_matriz_distancias(["AÇGT", "ACGT"])
+        self.assertEqual(matriz["AÇGT"]["ACGT"], 0.25)
+
     # ---------- upgma ----------
     def test_upgma_basico(self):
         sequencias = ["ATGC", "ATGA", "TTGC"]
@@ -41,6 +57,12 @@ class TestFilogenia(unittest.TestCase):
         self.assertIn("(", arvore)
         self.assertIn(")", arvore)
 
+    def test_upgma_nao_altera_matriz(self):
+        matriz = calcular_matriz_distancias(["ATGC", "ATGA", "TTGC"])
+        copia = {k: dict(v) for k, v in matriz.items()}
+        upgma(matriz)
+        self.assertEqual(matriz, copia)
+
     def test_upgma_duas_sequencias(self):
         sequencias = ["ATGC", "ATGA"]
         matriz = calcular_matriz_distancias(sequencias)
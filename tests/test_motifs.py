@@ -1,20 +1,32 @@
+import math
 import unittest
+from functools import lru_cache
+from types import MappingProxyType
 
 from bioinf.motifs import (
     iupac_para_regex,
     procura_iupac,
+    procura_iupac_many,
     prosite_para_regex,
     procura_prosite,
     digestao_dna,
     pwm,
     prob_gerar_sequencia,
+    log_prob_gerar_sequencia,
     seq_mais_provavel,
     pssm_de_pwm,
     score_kmer,
+    score_kmers_batch,
     melhor_subsequencia,
 )
 
 
+@lru_cache(maxsize=None)
+def _cached_pwm(motifs_t, tipo, pc):
+    # PWM partilhada entre testes; os testes não devem alterar o resultado
+    return pwm(list(motifs_t), tipo=tipo, pseudocontagem=pc)
+
+
 class TestMotifs(unittest.TestCase):
 
     # -------------------------
@@ -31,6 +43,12 @@ class TestMotifs(unittest.TestCase):
         # "AA" em "AAAA" sem overlap -> [0, 2]
         self.assertEqual(procura_iupac("AAAA", "AA"), [0, 2])
 
+    def test_procura_iupac_many(self):
+        res = procura_iupac_many(" atgcaatg", ["ATG", "AAT", "GG"])
+        self.assertEqual(res, {"ATG": [0, 5], "AAT": [4], "GG": []})
+        for p, pos in res.items():
+            self.assertEqual(pos, procura_iupac("ATGCAATG", p))
+
     # -------------------------
     # PROSITE
     # -------------------------
@@ -69,39 +87,91 @@ class TestMotifs(unittest.TestCase):
         # Seqs ["A","A"], DNA (ACGT), pseudocontagem=1:
         # denom = n + a*pseudo = 2 + 4 = 6
         # A = (2+1)/6 = 3/6 ; C = (0+1)/6 = 1/6
-        mat = pwm(["A", "A"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("A", "A"), "DNA", 1)
         self.assertAlmostEqual(mat[0]["A"], 3/6)
         self.assertAlmostEqual(mat[0]["C"], 1/6)
 
     def test_prob_gerar_sequencia_len_raises(self):
-        mat = pwm(["AA", "AT"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("AA", "AT"), "DNA", 1)
         with self.assertRaises(ValueError):
             prob_gerar_sequencia("A", mat)
 
+    def test_log_prob_gerar_sequencia(self):
+        mat = _cached_pwm(("ACG", "ACG", "ATG"), "DNA", 1)
+        self.assertAlmostEqual(math.exp(log_prob_gerar_sequencia("ACG", mat)),
+                               prob_gerar_sequencia("ACG", mat))
+        # motif longo: o produto chega a 0.0, o log continua finito
+        longo = _cached_pwm(("A" * 600,), "DNA", 1)
+        self.assertEqual(prob_gerar_sequencia("C" * 600, longo), 0.0)
+        self.assertAlmostEqual(log_prob_gerar_sequencia("C" * 600, longo), 600 * math.log(1/5))
+        self.assertEqual(log_prob_gerar_sequencia("C", [{"A": 1.0, "C": 0.0}]), float("-inf"))
+        with self.assertRaises(ValueError):
+            log_prob_gerar_sequencia("A", mat)
+
     def test_seq_mais_provavel(self):
-        mat = pwm(["AAA", "AAA"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("AAA", "AAA"), "DNA", 1)
         subs = seq_mais_provavel("TTTAAATTT", mat)
         self.assertEqual(subs, ["AAA"])  # devolve lista
 
+    def test_seq_mais_provavel_motif_curto_empates(self):
+        # 4**2 <= n // 4: pontua cada janela distinta uma só vez
+        mat = _cached_pwm(("AC", "CA"), "DNA", 1)
+        seq = "ACGTTGCAAC" * 10
+        janelas = [seq[i:i+2] for i in range(len(seq) - 1)]
+        probs = {j: prob_gerar_sequencia(j, mat) for j in janelas}
+        maior = max(probs.values())
+        esperado = sorted(j for j, p in probs.items() if p == maior)
+        self.assertEqual(esperado, ["AA", "AC", "CA"])
+        self.assertEqual(seq_mais_provavel(seq, mat), esperado)
+        # o mesmo resultado pelo caminho coluna a coluna (sequência curta)
+        self.assertEqual(seq_mais_provavel("ACGTTGCAACA", mat), esperado)
+
     # -------------------------
     # PSSM
     # -------------------------
     def test_pssm_e_melhor_subsequencia(self):
-        mat = pwm(["ACG", "ACG", "ATG"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("ACG", "ACG", "ATG"), "DNA", 1)
         pssm = pssm_de_pwm(mat, alfabeto="ACGT")
         best, pos, score = melhor_subsequencia(pssm, "TTTACGAAA")
         self.assertEqual(best, "ACG")
         self.assertEqual(pos, 3)
         self.assertNotEqual(score, float("-inf"))
 
+    def test_melhor_subsequencia_sem_janelas_possiveis(self):
+        pssm = [{"A": 1.0}, {"A": 1.0}]
+        self.assertEqual(melhor_subsequencia(pssm, "CAAAT"), ("AA", 1, 2.0))
+        self.assertEqual(melhor_subsequencia(pssm, "NNN"), ("", -1, float("-inf")))
+
+    def test_melhor_subsequencia_processos(self):
+        mat = _cached_pwm(("ACGTACGTAC", "ACGTTCGTAC"), "DNA", 1)
+        pssm = pssm_de_pwm(mat, alfabeto="ACGT")
+        seq = "TTGACGTACGTACAAACGTTCGTACGGN" * 20
+        self.assertEqual(melhor_subsequencia(pssm, seq, processos=2),
+                         melhor_subsequencia(pssm, seq))
+
     def test_score_kmer_len_raises(self):
-        mat = pwm(["ACG", "ACG", "ATG"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("ACG", "ACG", "ATG"), "DNA", 1)
         pssm = pssm_de_pwm(mat, alfabeto="ACGT")
         with self.assertRaises(ValueError):
             score_kmer(pssm, "AC")
 
+    def test_score_kmer_colunas_nao_dict(self):
+        # qualquer mapeamento com `.get` serve de coluna
+        pssm = [MappingProxyType({"A": 1.0}), MappingProxyType({"A": 2.0, "C": 0.5})]
+        self.assertEqual(score_kmer(pssm, "AC"), 1.5)
+        self.assertEqual(score_kmers_batch(pssm, ["AC", "CA"]), [1.5, float("-inf")])
+
+    def test_score_kmers_batch(self):
+        mat = _cached_pwm(("ACG", "ACG", "ATG"), "DNA", 1)
+        pssm = pssm_de_pwm(mat, alfabeto="ACGT")
+        kmers = ["ACG", "atg", "TTT", "ANG"]
+        self.assertEqual(score_kmers_batch(pssm, kmers), [score_kmer(pssm, k) for k in kmers])
+        self.assertEqual(score_kmers_batch(pssm, []), [])
+        with self.assertRaises(ValueError):
+            score_kmers_batch(pssm, ["ACG", "AC"])
+
     def test_melhor_subsequencia_short_seq_raises(self):
-        mat = pwm(["ACG", "ACG", "ATG"], tipo="DNA", pseudocontagem=1)
+        mat = _cached_pwm(("ACG", "ACG", "ATG"), "DNA", 1)
         pssm = pssm_de_pwm(mat, alfabeto="ACGT")
         with self.assertRaises(ValueError):
             melhor_subsequencia(pssm, "AC")